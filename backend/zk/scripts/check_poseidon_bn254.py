@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Poseidon BN254 Parameter Check (Python)
+Re-derives the round constants and MDS matrix embedded in poseidon_bn254.py with the
+Poseidon reference Grain LFSR and checks poseidon_hash_2 against circomlib test vectors.
+Exits non-zero on any mismatch.
+"""
+
+import sys
+from itertools import compress
+from typing import List, Tuple
+
+from poseidon_bn254 import (FIELD_BITS, FIELD_MODULUS, FULL_ROUNDS, MDS_MATRIX,
+                            PARTIAL_ROUNDS, ROUND_CONSTANTS, WIDTH, poseidon_hash_2)
+
+# circomlib poseidon([a, b]) outputs
+TEST_VECTORS = (
+    ((1, 2), 0x115cc0f5e7d690413df64c6b9662e9cf2a3617f2743245519e19607a4417189a),
+    ((0, 0), 0x2098f5fb9e239eab3ceac3f27b81e481dc3124d55ffed523a839ee8446b64864),
+)
+
+# Grain LFSR state size and the widest step whose taps are all already known
+_GRAIN_BITS = 80
+_GRAIN_STEP = 18
+_GRAIN_MASK = (1 << _GRAIN_BITS) - 1
+
+
+def _grain_output_bits():
+    """Yield chunks of the self-shrinking Grain LFSR stream used by the Poseidon reference"""
+    # Seed: field=1 (prime), sbox=0 (x^alpha), n, t, R_F, R_P, then thirty 1-bits
+    seed = (f"{1:02b}{0:04b}{FIELD_BITS:012b}{WIDTH:012b}"
+            f"{FULL_ROUNDS:010b}{PARTIAL_ROUNDS:010b}" + '1' * 30)
+    state = int(seed, 2)
+
+    def clock(count: int) -> str:
+        # new[i] = s[i+62] ^ s[i+51] ^ s[i+38] ^ s[i+23] ^ s[i+13] ^ s[i], s[0] is the MSB
+        nonlocal state
+        raw = []
+        for _ in range(0, count, _GRAIN_STEP):
+            new = 0
+            for tap in (62, 51, 38, 23, 13, 0):
+                new ^= state >> (_GRAIN_BITS - tap - _GRAIN_STEP)
+            new &= (1 << _GRAIN_STEP) - 1
+            state = ((state << _GRAIN_STEP) | new) & _GRAIN_MASK
+            raw.append(f"{new:0{_GRAIN_STEP}b}")
+        return ''.join(raw)
+
+    # Discard the first 160 bits (divisible by neither 18 nor 2, so warm up bit-exactly)
+    pending = clock(162)[160:]
+    while True:
+        raw = pending + clock(_GRAIN_STEP * 512)
+        # Keep an even length so bit pairs never straddle chunks
+        pending = raw[len(raw) & ~1:]
+        raw = raw[:len(raw) & ~1]
+        # Bits come in pairs: emit the second bit when the first is 1
+        yield ''.join(compress(raw[1::2], map('1'.__eq__, raw[0::2])))
+
+
+def derive_parameters() -> Tuple[List[int], List[List[int]]]:
+    """Derive round constants and MDS matrix exactly as the Poseidon reference script"""
+    chunks = _grain_output_bits()
+    buffer = ''
+
+    def random_field_bits() -> int:
+        nonlocal buffer
+        while len(buffer) < FIELD_BITS:
+            buffer += next(chunks)
+        value, buffer = int(buffer[:FIELD_BITS], 2), buffer[FIELD_BITS:]
+        return value
+
+    round_constants = []
+    for _ in range((FULL_ROUNDS + PARTIAL_ROUNDS) * WIDTH):
+        value = random_field_bits()
+        while value >= FIELD_MODULUS:
+            value = random_field_bits()
+        round_constants.append(value)
+
+    # Cauchy MDS matrix M[i][j] = 1 / (x_i + y_j)
+    points = [random_field_bits() % FIELD_MODULUS for _ in range(2 * WIDTH)]
+    xs, ys = points[:WIDTH], points[WIDTH:]
+    mds = [[pow(x + y, FIELD_MODULUS - 2, FIELD_MODULUS) for y in ys] for x in xs]
+
+    return round_constants, mds
+
+
+def main() -> int:
+    """Run all checks and report each result"""
+    round_constants, mds = derive_parameters()
+    failures = 0
+
+    checks = [('round constants', tuple(round_constants) == ROUND_CONSTANTS),
+              ('MDS matrix', tuple(map(tuple, mds)) == MDS_MATRIX)]
+    for (a, b), expected in TEST_VECTORS:
+        checks.append((f'Poseidon({a}, {b})', poseidon_hash_2(a, b) == expected))
+
+    for name, ok in checks:
+        print(f"{'OK  ' if ok else 'FAIL'} {name}")
+        failures += not ok
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
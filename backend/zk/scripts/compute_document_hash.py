@@ -4,17 +4,63 @@ Document Hash Computation Helper (Python)
 Computes SHA-256 hash of documents and converts to field elements for Noir circuits
 """
 
+# Start-up cost matters for one-process-per-document use, so json, argparse, ssl,
+# secrets, multiprocessing and the optional accelerators are imported where first needed
 import hashlib
-import json
+import importlib
+import logging
+import mmap
 import os
 import sys
-import argparse
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, Tuple, Optional
-import secrets
+from typing import Dict, List, NamedTuple, Tuple, Optional
 
-# BN254 field modulus (same as used in Noir circuits)
-FIELD_MODULUS = 21888242871839275222246405745257275088548364400416034343698204186575808495617
+from poseidon_bn254 import FIELD_MODULUS, poseidon_hash_2
+
+sha256 = hashlib.sha256
+
+log = logging.getLogger(__name__)
+
+# BN254 field modulus (from poseidon_bn254, same as used in Noir circuits) as 32 big-endian bytes
+_FM_BYTES = FIELD_MODULUS.to_bytes(32, 'big')
+
+# Read size used when streaming files through SHA-256
+HASH_CHUNK_SIZE = 1 << 20
+
+# Files larger than this are hashed straight from a read-only memory map
+MMAP_THRESHOLD = 16 << 20
+
+# Normalized text lines joined per hasher update
+TEXT_HASH_BLOCK_LINES = 4096
+
+# Importing numba costs ~0.4 s even with a warm kernel cache, and the kernel is
+# ~3x faster than the bytes path only on short-line text (~par on long lines),
+# so it is used only for ASCII documents large enough to repay the import
+NUMBA_TEXT_THRESHOLD = 32 << 20
+
+# Bytes each batch worker should hash per task before returning results
+BATCH_TARGET_BYTES = 64 << 20
+
+# Average content-defined chunk size for --incremental chunk roots
+CDC_AVG_CHUNK_SIZE = 64 << 10
+
+# Extensions whose normalization needs the whole document in memory
+TEXT_EXTENSIONS = ('.txt', '.md', '.csv')
+JSON_EXTENSIONS = ('.json',)
+BINARY_EXTENSIONS = ('.pdf', '.docx', '.xlsx', '.png', '.jpg', '.jpeg')
+
+# ASCII characters str.rstrip() treats as whitespace, minus the line terminators
+_ASCII_BLANKS = b' \t\x0b\x0c\x1c\x1d\x1e\x1f'
+
+# orjson spells exponent floats ("1e16") and values below 1e-4 ("0.00001") differently
+# from json.dumps; folding digits to '0' lets a substring check spot both forms.
+# Matches inside strings only cost a fallback to json.
+_DIGITS_TO_ZERO = bytes.maketrans(b'123456789', b'000000000')
+_ORJSON_FLOAT_MISMATCHES = (b'0e', b'0.0000')
+
+# SHA-256 providers selectable with --hash-backend
+HASH_BACKENDS = ('hashlib', 'pyca')
 
 # Document type constants (matching circuit definitions)
 DOC_TYPES = {
@@ -44,38 +90,131 @@ DOC_TYPE_NAMES = {
 }
 
 
-def normalize_text_document(data: bytes) -> bytes:
-    """Normalize text documents for canonical hashing"""
+@lru_cache(maxsize=None)
+def optional_import(module_name: str):
+    """Import an optional dependency on first use, returning None if it is not installed"""
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        return None
+
+
+@lru_cache(maxsize=1)
+def canonical_json_encoder():
+    """Encoder reused across documents; json.dumps builds a new one per call for non-default options"""
+    import json
+    return json.JSONEncoder(separators=(',', ':'), sort_keys=True)
+
+
+def numba_text_kernel(data: bytes):
+    """normalize_text_numba for large ASCII documents, or None to use the bytes path"""
+    if len(data) < NUMBA_TEXT_THRESHOLD or not data.isascii():
+        return None
+    return optional_import('normalize_text_numba')
+
+
+def normalized_text_lines(data: bytes) -> Optional[List]:
+    """Split a text document into normalized lines, or None if it is not UTF-8
+    
+    ASCII input yields bytes lines, anything else str lines. Trailing empty lines
+    are kept; callers drop them when joining.
+    """
+    if data.isascii():
+        # ASCII is already valid UTF-8: normalize the bytes directly and skip the
+        # decode/encode round-trip (same result as the str path below)
+        data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        return [line.rstrip(_ASCII_BLANKS) for line in data.split(b'\n')]
+    
     try:
         text = data.decode('utf-8')
-        
-        # Normalize line endings to LF
-        text = text.replace('\r\n', '\n').replace('\r', '\n')
-        
-        # Trim trailing whitespace from lines
-        lines = [line.rstrip() for line in text.split('\n')]
-        text = '\n'.join(lines)
-        
-        # Remove final trailing newline if present
-        text = text.rstrip('\n')
-        
-        return text.encode('utf-8')
     except UnicodeDecodeError:
-        print("Warning: Text decoding failed, using raw bytes")
+        return None
+    
+    # Normalize line endings to LF
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    
+    # Trim trailing whitespace from lines
+    return [line.rstrip() for line in text.split('\n')]
+
+
+def normalize_text_document(data: bytes) -> bytes:
+    """Normalize text documents for canonical hashing"""
+    numba_text = numba_text_kernel(data)
+    if numba_text is not None:
+        return numba_text.normalize_ascii_text(data)
+    
+    lines = normalized_text_lines(data)
+    if lines is None:
+        log.warning("Warning: Text decoding failed, using raw bytes")
         return data
+    
+    # Remove final trailing newline if present
+    if lines and isinstance(lines[0], str):
+        return '\n'.join(lines).rstrip('\n').encode('utf-8')
+    return b'\n'.join(lines).rstrip(b'\n')
+
+
+def hash_text_document(data: bytes, hash_backend: str = 'hashlib') -> Tuple[bytes, int]:
+    """Hash a normalized text document without building the joined document
+    
+    Lines are fed to the hasher in blocks of TEXT_HASH_BLOCK_LINES, so only one
+    block is materialized at a time. Returns the digest and normalized size.
+    """
+    # The Numba kernel is not used here: it returns the whole normalized document
+    lines = normalized_text_lines(data)
+    if lines is None:
+        log.warning("Warning: Text decoding failed, using raw bytes")
+        return new_sha256(data, hash_backend).digest(), len(data)
+    
+    # Trailing empty lines are the trailing newlines the normalized form drops
+    end = len(lines)
+    while end and not lines[end - 1]:
+        end -= 1
+    
+    hasher = new_sha256(backend=hash_backend)
+    size = 0
+    for start in range(0, end, TEXT_HASH_BLOCK_LINES):
+        block = lines[start:min(start + TEXT_HASH_BLOCK_LINES, end)]
+        if isinstance(block[0], str):
+            chunk = '\n'.join(block).encode('utf-8')
+        else:
+            chunk = b'\n'.join(block)
+        if start:
+            hasher.update(b'\n')
+            size += 1
+        hasher.update(chunk)
+        size += len(chunk)
+    
+    return hasher.digest(), size
 
 
 def normalize_json_document(data: bytes) -> bytes:
     """Normalize JSON documents for canonical hashing"""
+    import json
+    
+    orjson = optional_import('orjson')
+    if orjson is not None:
+        try:
+            normalized = orjson.dumps(orjson.loads(data), option=orjson.OPT_SORT_KEYS)
+        except (orjson.JSONDecodeError, orjson.JSONEncodeError):
+            normalized = None
+        
+        # orjson writes raw UTF-8/DEL and different float spellings, so only keep
+        # its output when it is byte-identical to the json.dumps form below
+        if normalized is not None and normalized.isascii() and b'\x7f' not in normalized:
+            folded = normalized.translate(_DIGITS_TO_ZERO)
+            if not any(pattern in folded for pattern in _ORJSON_FLOAT_MISMATCHES):
+                return normalized
+    
     try:
         json_data = json.loads(data.decode('utf-8'))
         
         # Stringify with consistent formatting (no whitespace, sorted keys)
-        normalized_json = json.dumps(json_data, separators=(',', ':'), sort_keys=True)
+        normalized_json = canonical_json_encoder().encode(json_data)
         
         return normalized_json.encode('utf-8')
     except (json.JSONDecodeError, UnicodeDecodeError):
-        print("Warning: JSON parsing failed, using raw bytes")
+        log.warning("Warning: JSON parsing failed, using raw bytes")
         return data
 
 
@@ -83,96 +222,392 @@ def normalize_document(data: bytes, file_extension: str) -> bytes:
     """Apply document-type-specific normalization"""
     ext = file_extension.lower()
     
-    if ext in ['.txt', '.md', '.csv']:
+    if ext in TEXT_EXTENSIONS:
         return normalize_text_document(data)
-    elif ext == '.json':
+    elif ext in JSON_EXTENSIONS:
         return normalize_json_document(data)
-    elif ext in ['.pdf', '.docx', '.xlsx', '.png', '.jpg', '.jpeg']:
-        print(f"Warning: Binary file {ext} used without normalization")
-        return data
     else:
-        print(f"Warning: Unknown file type {ext}, using raw bytes")
+        warn_unnormalized(ext)
         return data
 
 
-def compute_document_hash(file_path: str, normalize: bool = True) -> Dict:
-    """Compute SHA-256 hash of document and convert to field element"""
+def warn_unnormalized(ext: str) -> None:
+    """Warn that a document type is hashed as raw bytes"""
+    if ext in BINARY_EXTENSIONS:
+        log.warning("Warning: Binary file %s used without normalization", ext)
+    else:
+        log.warning("Warning: Unknown file type %s, using raw bytes", ext)
+
+
+class PycaSha256:
+    """hashlib-style wrapper around cryptography's OpenSSL EVP SHA-256"""
+    
+    name = 'sha256'
+    
+    def __init__(self, data: bytes = b''):
+        pyca_hashes = optional_import('cryptography.hazmat.primitives.hashes')
+        if pyca_hashes is None:
+            raise RuntimeError("Hash backend 'pyca' requires the 'cryptography' package")
+        self._ctx = pyca_hashes.Hash(pyca_hashes.SHA256())
+        self._digest = None
+        if data:
+            self._ctx.update(data)
+    
+    def update(self, data: bytes) -> None:
+        self._ctx.update(data)
+    
+    def digest(self) -> bytes:
+        # finalize() can only run once; keep the result so repeated calls behave like hashlib
+        if self._digest is None:
+            self._digest = self._ctx.finalize()
+        return self._digest
+    
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+
+def check_hash_backend(backend: str = 'hashlib') -> None:
+    """Verify the SHA-256 backend is usable
+    
+    Both backends dispatch to OpenSSL, which selects SHA-NI on capable CPUs and
+    falls back to its AVX2/SSSE3 assembly otherwise.
+    """
+    if backend not in HASH_BACKENDS:
+        raise ValueError(f"Unknown hash backend: {backend}")
+    if 'sha256' not in hashlib.algorithms_guaranteed or sha256().name != 'sha256':
+        raise RuntimeError("hashlib does not provide a usable SHA-256 implementation")
+    if backend == 'pyca' and optional_import('cryptography.hazmat.primitives.hashes') is None:
+        raise RuntimeError("Hash backend 'pyca' requires the 'cryptography' package")
+
+
+def openssl_version() -> str:
+    """OpenSSL build backing the hash backends"""
+    import ssl
+    return ssl.OPENSSL_VERSION
+
+
+def new_sha256(data: bytes = b'', backend: str = 'hashlib'):
+    """Create a SHA-256 hasher for the selected backend"""
+    if backend == 'hashlib':
+        return sha256(data)
+    if backend == 'pyca':
+        return PycaSha256(data)
+    raise ValueError(f"Unknown hash backend: {backend}")
+
+
+def hash_file_mmap(file_path: str, backend: str = 'hashlib') -> bytes:
+    """Hash a large file from the page cache via mmap, avoiding a copy into user buffers"""
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # madvise is unavailable on Windows
+        if hasattr(mm, 'madvise'):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+            mm.madvise(mmap.MADV_WILLNEED)
+        
+        hasher = new_sha256(backend=backend)
+        view = memoryview(mm)
+        try:
+            for offset in range(0, len(view), HASH_CHUNK_SIZE):
+                hasher.update(view[offset:offset + HASH_CHUNK_SIZE])
+        finally:
+            view.release()
+        return hasher.digest()
+
+
+def hash_file_stream(file_path: str, backend: str = 'hashlib') -> bytes:
+    """Stream a file through SHA-256 in bounded memory and return the digest"""
+    if os.path.getsize(file_path) > MMAP_THRESHOLD:
+        return hash_file_mmap(file_path, backend)
+    
+    with open(file_path, 'rb', buffering=0) as f:
+        if backend == 'hashlib' and hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'sha256').digest()
+        
+        # pyca backend or Python < 3.11: chunked update loop
+        hasher = new_sha256(backend=backend)
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+        return hasher.digest()
+
+
+def write_text_atomic(file_path: str, text: str) -> None:
+    """Write a file via a temporary sibling and os.replace so readers never see a partial file
+    
+    The data is fsynced before the rename, so after a crash the target holds either
+    the old or the new contents.
+    """
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    
+    # Persist the rename itself; directories cannot be opened this way on Windows
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(os.path.dirname(os.path.abspath(file_path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def load_chunk_cache(cache_path: str) -> Dict:
+    """Load the --incremental chunk cache, starting empty if it does not exist yet"""
+    if not os.path.exists(cache_path):
+        return {}
+    import json
+    with open(cache_path, 'r') as f:
+        return json.load(f)
+
+
+def save_chunk_cache(cache_path: str, cache: Dict) -> None:
+    """Persist the --incremental chunk cache"""
+    import json
+    write_text_atomic(cache_path, json.dumps(cache, separators=(',', ':')))
+
+
+def hash_document_chunked(file_path: str, normalize: bool, hash_backend: str,
+                          chunk_cache: Dict) -> Tuple[bytes, int]:
+    """Hash a document as SHA-256 over its content-defined chunk digests
+    
+    The file is always read and re-chunked; file metadata is never trusted for the
+    digest. chunk_cache maps resolved paths to the chunk digests of the last run and
+    is used to report which chunks (Merkle leaves) changed since then.
+    """
+    fastcdc_module = optional_import('fastcdc')
+    if fastcdc_module is None:
+        raise RuntimeError("--incremental requires the 'fastcdc' package")
+    
+    key = str(Path(file_path).resolve())
+    entry = chunk_cache.get(key)
+    
+    ext = Path(file_path).suffix.lower()
+    if normalize and ext in TEXT_EXTENSIONS + JSON_EXTENSIONS:
+        with open(file_path, 'rb') as f:
+            source = normalize_document(f.read(), ext)
+        normalized_size = len(source)
+    else:
+        if normalize:
+            warn_unnormalized(ext)
+        normalized_size = os.path.getsize(file_path)
+        # fastcdc mmaps a path, which fails for an empty file; b'' yields no chunks
+        source = file_path if normalized_size else b''
+    
+    chunks = fastcdc_module.fastcdc(source, avg_size=CDC_AVG_CHUNK_SIZE, fat=False,
+                                    hf=lambda data: new_sha256(data, hash_backend))
+    chunk_hashes = [chunk.hash for chunk in chunks]
+    
+    if entry and entry['normalized'] == normalize:
+        previous = set(entry['chunks'])
+        changed = sum(1 for chunk_hash in chunk_hashes if chunk_hash not in previous)
+        log.info("Incremental cache: %d of %d chunks changed", changed, len(chunk_hashes))
+    
+    chunk_cache[key] = {
+        'normalized': normalize,
+        'chunks': chunk_hashes
+    }
+    
+    root = new_sha256(b''.join(bytes.fromhex(chunk_hash) for chunk_hash in chunk_hashes), hash_backend)
+    return root.digest(), normalized_size
+
+
+def hash_document(file_path: str, normalize: bool = True, hash_backend: str = 'hashlib',
+                  chunk_cache: Optional[Dict] = None) -> Tuple[bytes, int]:
+    """Hash a document, returning its SHA-256 digest and normalized size
+    
+    With a chunk_cache the digest is the content-defined chunk root instead of the
+    single-shot SHA-256 (see hash_document_chunked).
+    """
+    if chunk_cache is not None:
+        return hash_document_chunked(file_path, normalize, hash_backend, chunk_cache)
+    
+    ext = Path(file_path).suffix.lower()
+    
+    # Only text/JSON normalization needs the document in memory;
+    # everything else is streamed straight through the hasher
+    if normalize and ext in TEXT_EXTENSIONS:
+        with open(file_path, 'rb') as f:
+            return hash_text_document(f.read(), hash_backend)
+    
+    if normalize and ext in JSON_EXTENSIONS:
+        with open(file_path, 'rb') as f:
+            normalized_data = normalize_document(f.read(), ext)
+        return new_sha256(normalized_data, hash_backend).digest(), len(normalized_data)
+    
+    if normalize:
+        warn_unnormalized(ext)
+    return hash_file_stream(file_path, hash_backend), os.path.getsize(file_path)
+
+
+def batch_chunksize(files: List[Path], workers: int) -> int:
+    """Files per worker task, aiming for ~BATCH_TARGET_BYTES while keeping every worker busy"""
+    total_size = sum(os.path.getsize(file) for file in files)
+    average_size = max(1, total_size // len(files))
+    per_worker = -(-len(files) // workers)
+    return max(1, min(BATCH_TARGET_BYTES // average_size, per_worker))
+
+
+def batch_hash(files: List[Path], normalize: bool = True, hash_backend: str = 'hashlib',
+               chunk_cache: Optional[Dict] = None, jobs: Optional[int] = None) -> List[bytes]:
+    """Hash many documents across worker processes, returning one digest per file
+    
+    Runs in-process for a single job or file, and with a chunk_cache, whose
+    updates would otherwise be lost in the workers.
+    """
+    if jobs is not None and jobs < 1:
+        raise ValueError(f"jobs must be a positive integer, got {jobs}")
+    workers = jobs or os.cpu_count() or 1
+    
+    if workers == 1 or len(files) < 2 or chunk_cache is not None:
+        return [hash_document(str(file), normalize, hash_backend, chunk_cache)[0] for file in files]
+    
+    from concurrent.futures import ProcessPoolExecutor
+    
+    worker = partial(hash_document, normalize=normalize, hash_backend=hash_backend)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(worker, [str(file) for file in files],
+                               chunksize=batch_chunksize(files, workers))
+        return [digest for digest, _ in results]
+
+
+class DocHash(NamedTuple):
+    """Document SHA-256 digest; textual forms are derived only when read"""
+    digest: bytes
+    file_path: str
+    file_size: int
+    normalized_size: int
+    normalized: bool
+    
+    @property
+    def hex(self) -> str:
+        return self.digest.hex()
+    
+    @property
+    def int_value(self) -> int:
+        return int.from_bytes(self.digest, 'big')
+    
+    @property
+    def decimal(self) -> str:
+        return str(self.int_value)
+    
+    def field_element(self, decimal: bool = False) -> str:
+        """Field element as Noir accepts it: 0x-prefixed hex, or a decimal string"""
+        return self.decimal if decimal else '0x' + self.hex
+
+
+def compute_document_hash(file_path: str, normalize: bool = True, hash_backend: str = 'hashlib',
+                          decimal: bool = False, chunk_cache: Optional[Dict] = None) -> DocHash:
+    """Compute SHA-256 hash of document and convert to field element
+    
+    The field element is emitted as 0x-prefixed hex, which Noir accepts for Field
+    inputs; pass decimal=True for the previous decimal string.
+    """
     path_obj = Path(file_path)
     
     if not path_obj.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
     
-    # Read file
-    with open(file_path, 'rb') as f:
-        file_data = f.read()
-    
-    file_size = len(file_data)
+    file_size = path_obj.stat().st_size
     file_extension = path_obj.suffix
     
-    print(f"Processing file: {file_path}")
-    print(f"File size: {file_size} bytes")
-    print(f"File type: {file_extension or 'unknown'}")
+    log.info("Processing file: %s", file_path)
+    log.info("File size: %d bytes", file_size)
+    log.info("File type: %s", file_extension or 'unknown')
     
-    # Apply normalization if requested
     if normalize:
-        print("Applying document normalization...")
-        normalized_data = normalize_document(file_data, file_extension)
-        
-        if len(normalized_data) != file_size:
-            print(f"Normalized size: {len(normalized_data)} bytes")
-    else:
-        normalized_data = file_data
+        log.info("Applying document normalization...")
     
-    # Compute SHA-256 hash
-    sha256_hash = hashlib.sha256(normalized_data).digest()
-    hash_hex = sha256_hash.hex()
+    sha256_hash, normalized_size = hash_document(file_path, normalize, hash_backend, chunk_cache)
     
-    print(f"SHA-256: {hash_hex}")
+    if normalized_size != file_size:
+        log.info("Normalized size: %d bytes", normalized_size)
     
-    # Convert to field element (big-endian interpretation)
-    hash_int = int.from_bytes(sha256_hash, 'big')
+    doc_hash = DocHash(sha256_hash, file_path, file_size, normalized_size, normalize)
     
-    # Check field modulus constraint
-    if hash_int >= FIELD_MODULUS:
-        raise ValueError(f"Hash value exceeds BN254 field modulus. Hash: {hash_int}, Modulus: {FIELD_MODULUS}")
+    if log.isEnabledFor(logging.INFO):
+        log.info("SHA-256: %s", doc_hash.hex)
     
-    field_element = str(hash_int)
-    print(f"Field element: {field_element}")
+    # Check field modulus constraint; equal-length big-endian bytes compare like the integers
+    if sha256_hash >= _FM_BYTES:
+        raise ValueError(f"Hash value exceeds BN254 field modulus. Hash: {doc_hash.int_value}, Modulus: {FIELD_MODULUS}")
     
-    return {
-        'file_path': file_path,
-        'file_size': file_size,
-        'normalized_size': len(normalized_data),
-        'sha256_hex': hash_hex,
-        'sha256_int': hash_int,
-        'field_element': field_element,
-        'normalized': normalize
-    }
+    # Field element is the big-endian interpretation of the digest
+    if log.isEnabledFor(logging.INFO):
+        log.info("Field element: %s", doc_hash.field_element(decimal))
+    
+    return doc_hash
 
 
-def generate_field_salt() -> str:
-    """Generate cryptographically secure random salt as field element"""
-    while True:
-        # Generate 32 random bytes
-        random_bytes = secrets.token_bytes(32)
-        salt_int = int.from_bytes(random_bytes, 'big')
-        
-        # Ensure it fits in the field
-        if salt_int < FIELD_MODULUS:
-            return str(salt_int)
+def generate_field_salt() -> int:
+    """Generate cryptographically secure random salt as field element
+    
+    Masking the draw to 253 bits keeps it below FIELD_MODULUS (> 2^253), giving a
+    uniform salt in [0, 2^253) from a single draw with no rejection loop.
+    """
+    import secrets
+    
+    random_bytes = bytearray(secrets.token_bytes(32))
+    random_bytes[0] &= 0x1F
+    return int.from_bytes(random_bytes, 'big')
+
+
+def create_commitment(doc_hash_int: int, salt_int: int) -> str:
+    """Create Poseidon(doc_hash, salt) commitment as recomputed by the circuit"""
+    commitment = poseidon_hash_2(doc_hash_int, salt_int)
+    return '0x' + commitment.to_bytes(32, 'big').hex()
 
 
 def create_commitment_placeholder(doc_hash_field: str, salt_field: str) -> str:
     """Create placeholder commitment (use actual Poseidon in production)"""
     # Placeholder implementation - use actual Poseidon hash in production
     combined = doc_hash_field + salt_field
-    sha256_commitment = hashlib.sha256(combined.encode()).hexdigest()
-    print("Warning: Using SHA-256 as Poseidon placeholder")
+    sha256_commitment = sha256(combined.encode()).hexdigest()
+    log.warning("Warning: Using SHA-256 as Poseidon placeholder")
     return '0x' + sha256_commitment
 
 
+def format_prover_inputs(commitment: str, doc_type: int, enable_type_check: int,
+                         doc_hash_raw: str, salt: str) -> str:
+    """Format document_hash_proof circuit inputs as Prover.toml lines"""
+    return (f'doc_commitment = "{commitment}"\n'
+            f'doc_type_code = "{doc_type}"\n'
+            f'enable_type_check = "{enable_type_check}"\n'
+            f'doc_hash_raw = "{doc_hash_raw}"\n'
+            f'salt = "{salt}"\n'
+            f'expected_doc_type = "{doc_type}"\n')
+
+
+def cli_batch(batch_dir: str, normalize: bool = True, hash_backend: str = 'hashlib',
+              chunk_cache: Optional[Dict] = None, jobs: Optional[int] = None) -> None:
+    """Hash every file in a directory and print one digest per line"""
+    dir_obj = Path(batch_dir)
+    
+    if not dir_obj.is_dir():
+        raise NotADirectoryError(f"Not a directory: {batch_dir}")
+    
+    files = sorted(path for path in dir_obj.iterdir() if path.is_file())
+    
+    for file, digest in zip(files, batch_hash(files, normalize, hash_backend, chunk_cache, jobs)):
+        print(f"{digest.hex()}  {file}")
+    
+    log.info("\nHashed %d files from: %s", len(files), batch_dir)
+
+
 def main():
     """Main CLI function"""
+    import argparse
+    
+    def positive_int(value: str) -> int:
+        number = int(value)
+        if number < 1:
+            raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+        return number
+    
     parser = argparse.ArgumentParser(
         description='Document Hash Computation Helper',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -193,90 +628,151 @@ Examples:
   python compute_document_hash.py document.pdf
   python compute_document_hash.py contract.json --type 7
   python compute_document_hash.py cert.pdf --no-normalize --salt 12345...
+  python compute_document_hash.py scan.pdf --hash-backend pyca
+  python compute_document_hash.py --batch ./kyc_documents/ --jobs 4
+  python compute_document_hash.py report.txt --decimal
+  python compute_document_hash.py filing.pdf --incremental chunks.json
         '''
     )
     
-    parser.add_argument('file_path', help='Path to document file')
+    parser.add_argument('file_path', nargs='?', help='Path to document file')
+    parser.add_argument('--batch', metavar='DIR',
+                       help='Hash every file in DIR')
+    parser.add_argument('--jobs', type=positive_int, metavar='N',
+                       help='Worker processes for --batch (default: CPU count)')
     parser.add_argument('--no-normalize', action='store_true', 
                        help='Skip document normalization')
     parser.add_argument('--type', type=int, choices=range(1, 100),
                        help='Document type code (1-99)')
     parser.add_argument('--salt', type=str,
                        help='Use specific salt (field element as string)')
+    parser.add_argument('--hash-backend', choices=HASH_BACKENDS, default='hashlib',
+                       help='SHA-256 implementation (pyca requires the cryptography package)')
+    parser.add_argument('--decimal', action='store_true',
+                       help='Emit doc_hash_raw as a decimal string instead of 0x-prefixed hex')
+    parser.add_argument('--placeholder-commitment', action='store_true',
+                       help='Use the legacy SHA-256 placeholder instead of Poseidon for doc_commitment '
+                            '(implies --decimal, as the placeholder hashed the decimal field element)')
+    parser.add_argument('--incremental', metavar='CACHE',
+                       help='Hash as a content-defined chunk root and report chunks changed since '
+                            'the digests recorded in CACHE (requires the fastcdc package)')
+    parser.add_argument('--quiet', action='store_true',
+                       help='Only print results, warnings and errors')
+    parser.add_argument('--verbose', action='store_true',
+                       help='Also print debug details (hash backend, OpenSSL build)')
     
     args = parser.parse_args()
     
+    # The legacy placeholder only reproduces earlier commitments over the decimal form
+    if args.placeholder_commitment:
+        args.decimal = True
+    
+    if args.quiet:
+        log_level = logging.WARNING
+    elif args.verbose:
+        log_level = logging.DEBUG
+    else:
+        log_level = logging.INFO
+    # Warnings and errors go to stderr; in --batch mode so does all other output,
+    # leaving stdout to the sha256sum-style result lines
+    if args.batch:
+        handlers = [logging.StreamHandler(sys.stderr)]
+    else:
+        progress_handler = logging.StreamHandler(sys.stdout)
+        progress_handler.addFilter(lambda record: record.levelno < logging.WARNING)
+        problem_handler = logging.StreamHandler(sys.stderr)
+        problem_handler.setLevel(logging.WARNING)
+        handlers = [progress_handler, problem_handler]
+    logging.basicConfig(level=log_level, format='%(message)s', handlers=handlers)
+    
+    if not args.file_path and not args.batch:
+        parser.error('file_path is required unless --batch is given')
+    
     try:
-        # Compute document hash
-        hash_info = compute_document_hash(args.file_path, not args.no_normalize)
+        check_hash_backend(args.hash_backend)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Hash backend: %s (%s)", args.hash_backend, openssl_version())
+        
+        chunk_cache = load_chunk_cache(args.incremental) if args.incremental else None
+        
+        try:
+            if args.batch:
+                cli_batch(args.batch, not args.no_normalize, args.hash_backend, chunk_cache, args.jobs)
+                return
+            
+            # Compute document hash
+            doc_hash = compute_document_hash(args.file_path, not args.no_normalize, args.hash_backend,
+                                              args.decimal, chunk_cache)
+        finally:
+            # Keep chunk digests even if the root is rejected by the field check
+            if args.incremental:
+                save_chunk_cache(args.incremental, chunk_cache)
         
         # Generate or use provided salt
         if args.salt:
             try:
-                salt_field = str(int(args.salt))
-                if int(args.salt) >= FIELD_MODULUS:
+                salt_int = int(args.salt)
+                if salt_int >= FIELD_MODULUS:
                     raise ValueError("Salt exceeds field modulus")
+                # The circuit asserts salt != 0, and a negative salt would be written
+                # to Prover.toml unreduced
+                if salt_int <= 0:
+                    raise ValueError("Salt must be a positive field element")
             except ValueError as e:
-                print(f"Error: Invalid salt - {e}")
+                log.error("Error: Invalid salt - %s", e)
                 sys.exit(1)
         else:
-            salt_field = generate_field_salt()
+            salt_int = generate_field_salt()
+        salt_field = str(salt_int)
+        
+        hash_hex = doc_hash.hex
+        field_element = doc_hash.field_element(args.decimal)
         
-        # Create commitment (placeholder implementation)
-        commitment = create_commitment_placeholder(hash_info['field_element'], salt_field)
+        # Create commitment
+        if args.placeholder_commitment:
+            commitment = create_commitment_placeholder(field_element, salt_field)
+        else:
+            commitment = create_commitment(doc_hash.int_value, salt_int)
         
         doc_type = args.type or DOC_TYPES['OTHER']
         
-        print('\n--- Circuit Inputs ---')
-        print(f'doc_commitment = "{commitment}"')
-        print(f'doc_type_code = "{doc_type}"')
-        print(f'enable_type_check = "{1 if args.type else 0}"')
-        print(f'doc_hash_raw = "{hash_info["field_element"]}"')
-        print(f'salt = "{salt_field}"')
-        print(f'expected_doc_type = "{doc_type}"')
+        # Build the circuit inputs once; reused for stdout and Prover.toml
+        toml_body = format_prover_inputs(commitment, doc_type, 1 if args.type else 0,
+                                         field_element, salt_field)
+        prover_toml = f'# Generated from: {doc_hash.file_path}\n' + toml_body
+        
+        log.info('\n--- Circuit Inputs ---')
+        log.info('%s', toml_body.rstrip('\n'))
         
-        print('\n--- Summary ---')
-        print(f"File: {hash_info['file_path']}")
-        size_info = f"{hash_info['file_size']} bytes"
-        if hash_info['normalized_size'] != hash_info['file_size']:
-            size_info += f" ({hash_info['normalized_size']} normalized)"
-        print(f"Size: {size_info}")
-        print(f"SHA-256: {hash_info['sha256_hex']}")
-        print(f"Field Element: {hash_info['field_element']}")
-        print(f"Salt: {salt_field}")
-        print(f"Commitment: {commitment}")
+        log.info('\n--- Summary ---')
+        log.info("File: %s", doc_hash.file_path)
+        size_info = f"{doc_hash.file_size} bytes"
+        if doc_hash.normalized_size != doc_hash.file_size:
+            size_info += f" ({doc_hash.normalized_size} normalized)"
+        log.info("Size: %s", size_info)
+        log.info("SHA-256: %s", hash_hex)
+        log.info("Field Element: %s", field_element)
+        log.info("Salt: %s", salt_field)
+        log.info("Commitment: %s", commitment)
         type_info = f"{doc_type}"
         if args.type:
             type_info += f" ({DOC_TYPE_NAMES.get(doc_type, 'Unknown')})"
         else:
             type_info += " (Not specified)"
-        print(f"Document Type: {type_info}")
+        log.info("Document Type: %s", type_info)
         
         # Output Prover.toml format
         print('\n--- Prover.toml Format ---')
-        print(f'# Generated from: {hash_info["file_path"]}')
-        print(f'doc_commitment = "{commitment}"')
-        print(f'doc_type_code = "{doc_type}"')
-        print(f'enable_type_check = "{1 if args.type else 0}"')
-        print(f'doc_hash_raw = "{hash_info["field_element"]}"')
-        print(f'salt = "{salt_field}"')
-        print(f'expected_doc_type = "{doc_type}"')
+        print(prover_toml, end='')
         
         # Save to file option
         output_file = f"{Path(args.file_path).stem}_prover.toml"
-        with open(output_file, 'w') as f:
-            f.write(f'# Generated from: {hash_info["file_path"]}\n')
-            f.write(f'doc_commitment = "{commitment}"\n')
-            f.write(f'doc_type_code = "{doc_type}"\n')
-            f.write(f'enable_type_check = "{1 if args.type else 0}"\n')
-            f.write(f'doc_hash_raw = "{hash_info["field_element"]}"\n')
-            f.write(f'salt = "{salt_field}"\n')
-            f.write(f'expected_doc_type = "{doc_type}"\n')
+        write_text_atomic(output_file, prover_toml)
         
-        print(f'\nProver inputs saved to: {output_file}')
+        log.info('\nProver inputs saved to: %s', output_file)
         
     except Exception as error:
-        print(f'Error: {error}')
+        log.error('Error: %s', error)
         sys.exit(1)
 
 
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Numba-compiled Text Normalization (optional)
+Single-pass version of the ASCII text normalization in compute_document_hash.py.
+Importing this module raises ImportError when numpy/numba are not installed.
+"""
+
+import numpy as np
+from numba import njit, types
+
+# Input is a read-only view over the document bytes (np.frombuffer on bytes)
+_READONLY_BYTES = types.Array(types.uint8, 1, 'C', readonly=True)
+
+LF = 10
+CR = 13
+
+
+@njit(types.uint8[::1](_READONLY_BYTES), cache=True)
+def _normalize(buf):
+    """CRLF/CR -> LF, strip trailing blanks per line and at end of document"""
+    out = np.empty(buf.shape[0], dtype=np.uint8)
+    o = 0           # write position
+    line_keep = 0   # output length up to the last non-blank byte of the current line
+    doc_keep = 0    # output length up to the last non-blank, non-newline byte
+    i = 0
+    n = buf.shape[0]
+
+    while i < n:
+        c = buf[i]
+        if c == LF or c == CR:
+            if c == CR and i + 1 < n and buf[i + 1] == LF:
+                i += 1
+            o = line_keep
+            out[o] = LF
+            o += 1
+            line_keep = o
+        elif c == 32 or c == 9 or c == 11 or c == 12 or (28 <= c <= 31):
+            # Blanks as str.rstrip() sees them; kept unless the line ends first
+            out[o] = c
+            o += 1
+        else:
+            out[o] = c
+            o += 1
+            line_keep = o
+            doc_keep = o
+        i += 1
+
+    return out[:doc_keep]
+
+
+def normalize_ascii_text(data: bytes) -> bytes:
+    """Normalize an ASCII text document (caller must check data.isascii())"""
+    return _normalize(np.frombuffer(data, dtype=np.uint8)).tobytes()